@@ -0,0 +1,360 @@
+"""
+Planificador paralelo para las configuraciones de agentes (*.toml) de aea/.
+
+Carga varias configuraciones de agente, construye un grafo de dependencias (DAG)
+a partir de las entradas/salidas declaradas por cada tarea y ejecuta en paralelo
+las tareas independientes sobre un pool acotado de hilos o procesos.
+
+Formato de tareas admitido en [plan].tasks:
+
+    tasks = [
+        "Texto libre",                       # formato original: se ejecuta en orden
+        { name = "html", command = "make html", inputs = ["conf.py"], outputs = ["build/html"] },
+    ]
+
+- Las tareas de texto libre dependen de la tarea anterior del mismo agente,
+  igual que el comportamiento secuencial original.
+- Las tareas declaradas como tabla dependen de todas las tareas (de cualquier
+  agente) que producen alguna de sus 'inputs'. Con 'after = [...]' se pueden
+  añadir dependencias explícitas por nombre ("agente:tarea" o "tarea").
+
+Uso:
+    python scheduler.py docs_agent_config.toml otro_agent_config.toml --workers 4
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import tomllib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+STATUS_OK = "ok"
+STATUS_FAILED = "fallida"
+STATUS_SKIPPED = "omitida"
+
+
+@dataclass
+class Task:
+    """Una tarea del plan de un agente, ya normalizada."""
+    agent: str
+    name: str
+    description: str
+    command: str = None
+    working_dir: str = None
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    after: list = field(default_factory=list)
+
+    @property
+    def id(self):
+        return f"{self.agent}:{self.name}"
+
+
+@dataclass
+class TaskResult:
+    """Resultado de la ejecución de una tarea."""
+    task_id: str
+    status: str
+    start: float = 0.0
+    end: float = 0.0
+    details: str = ""
+
+    @property
+    def duration(self):
+        return max(self.end - self.start, 0.0)
+
+
+def load_agent_config(path):
+    """
+    Lee una configuración de agente y devuelve sus tareas normalizadas.
+
+    Args:
+        path (str): Ruta al archivo .toml del agente.
+
+    Returns:
+        list: Una lista de objetos Task en el orden declarado en el plan.
+    """
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+
+    agent = config.get("identity", {}).get("name") or os.path.splitext(os.path.basename(path))[0]
+    working_dir = config.get("environment", {}).get("working_dir")
+
+    tasks = []
+    previous = None
+    for index, raw in enumerate(config.get("plan", {}).get("tasks", []), start=1):
+        if isinstance(raw, str):
+            # Formato original: sin dependencias declaradas, se mantiene el orden del plan.
+            task = Task(agent=agent, name=f"t{index}", description=raw, working_dir=working_dir)
+            if previous is not None:
+                task.after.append(previous.id)
+        elif isinstance(raw, dict):
+            name = raw.get("name", f"t{index}")
+            task = Task(
+                agent=agent,
+                name=name,
+                description=raw.get("description", raw.get("command", name)),
+                command=raw.get("command"),
+                working_dir=raw.get("working_dir", working_dir),
+                inputs=list(raw.get("inputs", [])),
+                outputs=list(raw.get("outputs", [])),
+                after=[dep if ":" in dep else f"{agent}:{dep}" for dep in raw.get("after", [])],
+            )
+        else:
+            raise ValueError(f"{path}: tarea {index} con formato no soportado: {raw!r}")
+        tasks.append(task)
+        previous = task
+    return tasks
+
+
+def build_graph(tasks):
+    """
+    Construye el grafo de dependencias entre tareas.
+
+    Args:
+        tasks (list): Lista de objetos Task de uno o varios agentes.
+
+    Returns:
+        dict: Un diccionario {task_id: set(ids de las tareas de las que depende)}.
+
+    Raises:
+        ValueError: Si hay ids duplicados, dependencias desconocidas o ciclos.
+    """
+    by_id = {}
+    for task in tasks:
+        if task.id in by_id:
+            raise ValueError(f"Tarea duplicada: {task.id}")
+        by_id[task.id] = task
+
+    producers = {}
+    for task in tasks:
+        for output in task.outputs:
+            producers.setdefault(output, []).append(task.id)
+
+    graph = {}
+    for task in tasks:
+        deps = set()
+        for dep in task.after:
+            if dep not in by_id:
+                raise ValueError(f"La tarea {task.id} depende de una tarea desconocida: {dep}")
+            deps.add(dep)
+        for item in task.inputs:
+            # Las entradas que nadie produce se consideran externas.
+            deps.update(p for p in producers.get(item, []) if p != task.id)
+        graph[task.id] = deps
+
+    topological_order(graph)
+    return graph
+
+
+def topological_order(graph):
+    """
+    Devuelve los ids del grafo en orden topológico (algoritmo de Kahn).
+
+    Raises:
+        ValueError: Si el grafo contiene un ciclo.
+    """
+    pending = {node: len(deps) for node, deps in graph.items()}
+    dependents = {node: [] for node in graph}
+    for node, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(node)
+
+    ready = [node for node, count in pending.items() if count == 0]
+    order = []
+    while ready:
+        node = ready.pop()
+        order.append(node)
+        for child in dependents[node]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                ready.append(child)
+
+    if len(order) != len(graph):
+        cycle = sorted(node for node, count in pending.items() if count > 0)
+        raise ValueError(f"Ciclo de dependencias entre: {', '.join(cycle)}")
+    return order
+
+
+def run_task(task):
+    """
+    Ejecutor por defecto: lanza el 'command' de la tarea en su directorio de trabajo.
+
+    Las tareas sin 'command' (texto libre pensado para un agente) no se pueden
+    ejecutar aquí y se devuelven como omitidas.
+
+    Returns:
+        tuple: (estado, detalles)
+    """
+    if not task.command:
+        return STATUS_SKIPPED, "Tarea sin 'command'; requiere un agente."
+    if task.working_dir and not os.path.isdir(task.working_dir):
+        # Nunca ejecutar en otro directorio: comandos como 'make clean' serían peligrosos.
+        return STATUS_FAILED, f"El directorio de trabajo '{task.working_dir}' no existe."
+    result = subprocess.run(task.command, shell=True, cwd=task.working_dir or None,
+                            capture_output=True, text=True)
+    if result.returncode == 0:
+        return STATUS_OK, result.stdout
+    return STATUS_FAILED, result.stderr or f"Código de salida {result.returncode}"
+
+
+def _timed_run(runner, task):
+    start = time.time()
+    try:
+        status, details = runner(task)
+    except Exception as e:
+        status, details = STATUS_FAILED, f"Ocurrió una excepción: {e}"
+    return TaskResult(task.id, status, start, time.time(), details)
+
+
+class DagScheduler:
+    """
+    Ejecuta un conjunto de tareas respetando sus dependencias y en paralelo
+    cuando son independientes.
+    """
+    def __init__(self, tasks, max_workers=4, use_processes=False, runner=run_task):
+        if max_workers < 1:
+            raise ValueError(f"El número de workers debe ser positivo: {max_workers}")
+        self.tasks = {task.id: task for task in tasks}
+        self.graph = build_graph(tasks)
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.runner = runner
+
+    def levels(self):
+        """Agrupa las tareas en niveles que se pueden ejecutar simultáneamente."""
+        depth = {}
+        for node in topological_order(self.graph):
+            depth[node] = 1 + max((depth[dep] for dep in self.graph[node]), default=-1)
+        levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for node, level in depth.items():
+            levels[level].append(node)
+        return [sorted(level) for level in levels]
+
+    def run(self):
+        """
+        Ejecuta todas las tareas.
+
+        Una tarea se lanza en cuanto terminan todas sus dependencias. Si una
+        dependencia falla o se omite, las tareas que dependen de ella se omiten.
+
+        Returns:
+            dict: {task_id: TaskResult}
+        """
+        pending = {node: set(deps) for node, deps in self.graph.items()}
+        results = {}
+        running = {}
+        executor_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+
+        with executor_cls(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for node in sorted(n for n, deps in pending.items() if not deps - results.keys()):
+                    del pending[node]
+                    blocked = [dep for dep in self.graph[node] if results[dep].status != STATUS_OK]
+                    if blocked:
+                        now = time.time()
+                        results[node] = TaskResult(node, STATUS_SKIPPED, now, now,
+                                                   f"Dependencia no completada: {', '.join(sorted(blocked))}")
+                    else:
+                        future = executor.submit(_timed_run, self.runner, self.tasks[node])
+                        running[future] = node
+
+                if not running:
+                    # Las omisiones pueden desbloquear más tareas sin esperar a nadie.
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    results[node] = future.result()
+        return results
+
+    def critical_path(self, results):
+        """
+        Calcula la ruta crítica usando las duraciones medidas.
+
+        Solo cuentan las tareas completadas: las fallidas y omitidas no forman
+        parte de ninguna ruta.
+
+        Returns:
+            tuple: (lista de task_id de la ruta, duración total en segundos)
+        """
+        best = {}
+        parent = {}
+        for node in topological_order(self.graph):
+            if results[node].status != STATUS_OK:
+                continue
+            # Una tarea completada solo tiene dependencias completadas.
+            prev = max(self.graph[node], key=lambda dep: best[dep], default=None)
+            best[node] = results[node].duration + (best[prev] if prev else 0.0)
+            parent[node] = prev
+
+        if not best:
+            return [], 0.0
+        node = max(best, key=best.get)
+        total = best[node]
+        path = []
+        while node:
+            path.append(node)
+            node = parent[node]
+        return list(reversed(path)), total
+
+
+def format_report(results, critical_path, critical_time, wall_time):
+    """Genera un resumen legible de la ejecución."""
+    lines = []
+    for task_id in sorted(results, key=lambda t: results[t].start):
+        result = results[task_id]
+        lines.append(f"[{result.status:>7}] {task_id} ({result.duration:.2f}s)")
+    serial_time = sum(result.duration for result in results.values())
+    lines.append("")
+    if not any(result.status != STATUS_SKIPPED for result in results.values()):
+        lines.append("No se ejecutó ninguna tarea: todas fueron omitidas.")
+        return "\n".join(lines)
+    lines.append(f"Tiempo total (pared): {wall_time:.2f}s")
+    lines.append(f"Tiempo en serie:      {serial_time:.2f}s")
+    lines.append(f"Ruta crítica:         {critical_time:.2f}s")
+    if critical_path:
+        lines.append("  " + " -> ".join(critical_path))
+    if serial_time > 0 and wall_time > 0:
+        lines.append(f"Aceleración:          {serial_time / wall_time:.2f}x")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta en paralelo los planes de varios agentes.")
+    parser.add_argument("configs", nargs="+", help="Archivos .toml de configuración de agentes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Número máximo de tareas simultáneas.")
+    parser.add_argument("--processes", action="store_true",
+                        help="Usar un pool de procesos en lugar de hilos.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Solo muestra los niveles de ejecución, sin ejecutar nada.")
+    args = parser.parse_args(argv)
+
+    try:
+        tasks = []
+        for path in args.configs:
+            tasks.extend(load_agent_config(path))
+        scheduler = DagScheduler(tasks, max_workers=args.workers, use_processes=args.processes)
+    except (OSError, tomllib.TOMLDecodeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.dry_run:
+        for index, level in enumerate(scheduler.levels()):
+            print(f"Nivel {index}: {', '.join(level)}")
+        return 0
+
+    start = time.time()
+    results = scheduler.run()
+    wall_time = time.time() - start
+    path, critical_time = scheduler.critical_path(results)
+    print(format_report(results, path, critical_time, wall_time))
+    return 0 if all(r.status != STATUS_FAILED for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Añadir el directorio aea al path para poder importar scheduler
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scheduler import (DagScheduler, Task, STATUS_FAILED, STATUS_OK, STATUS_SKIPPED,
+                       build_graph, format_report, load_agent_config, main, run_task)
+
+
+def write_config(directory, filename, content):
+    path = os.path.join(directory, filename)
+    with open(path, 'w') as f:
+        f.write(content)
+    return path
+
+
+class TestLoadAgentConfig(unittest.TestCase):
+    """Pruebas para la carga de configuraciones de agentes."""
+
+    def test_string_tasks_keep_plan_order(self):
+        """Las tareas de texto libre dependen de la anterior del mismo agente."""
+        config = os.path.join(os.path.dirname(__file__), '..', 'docs_agent_config.toml')
+        tasks = load_agent_config(config)
+
+        self.assertEqual([t.id for t in tasks], ['docs-builder:t1', 'docs-builder:t2', 'docs-builder:t3'])
+        self.assertEqual(tasks[0].after, [])
+        self.assertEqual(tasks[2].after, ['docs-builder:t2'])
+
+    def test_table_tasks_and_cross_agent_dependencies(self):
+        """Las entradas de una tarea la hacen depender de quien las produce."""
+        with tempfile.TemporaryDirectory() as tmp:
+            planner = write_config(tmp, 'planner.toml', '''
+[identity]
+name = "planner"
+[plan]
+tasks = [{ name = "plan", command = "true", outputs = ["context.json"] }]
+''')
+            python = write_config(tmp, 'python.toml', '''
+[identity]
+name = "python"
+[plan]
+tasks = [
+    { name = "code", command = "true", inputs = ["context.json"], outputs = ["main.py"] },
+    { name = "deps", command = "true" },
+]
+''')
+            tasks = load_agent_config(planner) + load_agent_config(python)
+            graph = build_graph(tasks)
+
+        self.assertEqual(graph['python:code'], {'planner:plan'})
+        self.assertEqual(graph['python:deps'], set())
+
+    def test_cycle_is_rejected(self):
+        """Un ciclo en las dependencias provoca ValueError."""
+        tasks = [
+            Task('a', 'x', 'x', inputs=['2'], outputs=['1']),
+            Task('a', 'y', 'y', inputs=['1'], outputs=['2']),
+        ]
+        with self.assertRaises(ValueError):
+            build_graph(tasks)
+
+
+class TestDagScheduler(unittest.TestCase):
+    """Pruebas para la ejecución paralela del DAG."""
+
+    def test_independent_tasks_run_in_parallel(self):
+        """Las ramas independientes se ejecutan a la vez y la ruta crítica es la más larga."""
+        tasks = [
+            Task('a', 'root', 'root', outputs=['r']),
+            Task('b', 'left', 'left', inputs=['r'], outputs=['l']),
+            Task('c', 'right', 'right', inputs=['r']),
+            Task('d', 'join', 'join', inputs=['l']),
+        ]
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def runner(task):
+            with lock:
+                active.append(task.id)
+                peak.append(len(active))
+            time.sleep(0.1 if task.name != 'right' else 0.05)
+            with lock:
+                active.remove(task.id)
+            return STATUS_OK, ''
+
+        scheduler = DagScheduler(tasks, max_workers=4, runner=runner)
+        results = scheduler.run()
+        path, total = scheduler.critical_path(results)
+
+        self.assertTrue(all(r.status == STATUS_OK for r in results.values()))
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(path, ['a:root', 'b:left', 'd:join'])
+        self.assertGreaterEqual(total, 0.3)
+        self.assertLess(results['a:root'].end, results['c:right'].start + 1e-6)
+
+    def test_failure_skips_dependents(self):
+        """Si una tarea falla, las que dependen de ella se omiten."""
+        tasks = [
+            Task('a', 'build', 'build', outputs=['out']),
+            Task('a', 'deploy', 'deploy', inputs=['out']),
+            Task('b', 'lint', 'lint'),
+        ]
+
+        def runner(task):
+            return (STATUS_FAILED, 'boom') if task.name == 'build' else (STATUS_OK, '')
+
+        results = DagScheduler(tasks, max_workers=2, runner=runner).run()
+
+        self.assertEqual(results['a:build'].status, STATUS_FAILED)
+        self.assertEqual(results['a:deploy'].status, STATUS_SKIPPED)
+        self.assertEqual(results['b:lint'].status, STATUS_OK)
+
+    def test_critical_path_ignores_failed_and_skipped_tasks(self):
+        """Las tareas que no se completaron no forman parte de la ruta crítica."""
+        tasks = [
+            Task('a', 'slow', 'slow', outputs=['s']),
+            Task('a', 'after', 'after', inputs=['s']),
+            Task('b', 'fast', 'fast'),
+        ]
+
+        def runner(task):
+            if task.name == 'slow':
+                time.sleep(0.1)
+                return STATUS_FAILED, 'boom'
+            return STATUS_OK, ''
+
+        scheduler = DagScheduler(tasks, max_workers=2, runner=runner)
+        path, total = scheduler.critical_path(scheduler.run())
+
+        self.assertEqual(path, ['b:fast'])
+        self.assertLess(total, 0.1)
+
+    def test_report_when_nothing_ran(self):
+        """Si todo se omitió, el informe lo dice y no muestra ruta ni aceleración."""
+        tasks = [Task('a', 'x', 'x'), Task('a', 'y', 'y', after=['a:x'])]
+        scheduler = DagScheduler(tasks, runner=lambda task: (STATUS_SKIPPED, ''))
+        results = scheduler.run()
+        path, total = scheduler.critical_path(results)
+        report = format_report(results, path, total, 0.01)
+
+        self.assertEqual(path, [])
+        self.assertIn('No se ejecutó ninguna tarea', report)
+        self.assertNotIn('Ruta crítica', report)
+        self.assertNotIn('Aceleración', report)
+
+    def test_non_positive_workers_rejected(self):
+        with self.assertRaises(ValueError):
+            DagScheduler([Task('a', 'x', 'x')], max_workers=0)
+
+    def test_levels(self):
+        """levels agrupa las tareas que pueden ejecutarse simultáneamente."""
+        tasks = [
+            Task('a', 'x', 'x', outputs=['1']),
+            Task('b', 'y', 'y'),
+            Task('c', 'z', 'z', inputs=['1']),
+        ]
+        self.assertEqual(DagScheduler(tasks).levels(), [['a:x', 'b:y'], ['c:z']])
+
+
+class TestRunTask(unittest.TestCase):
+    """Pruebas para el ejecutor por defecto."""
+
+    def test_runs_in_configured_working_dir(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            status, details = run_task(Task('a', 'pwd', 'pwd', command='pwd', working_dir=tmp))
+        self.assertEqual(status, STATUS_OK)
+        self.assertEqual(os.path.realpath(details.strip()), os.path.realpath(tmp))
+
+    def test_missing_working_dir_fails_without_running(self):
+        """Si el directorio configurado no existe, el comando no se ejecuta en otro sitio."""
+        with tempfile.TemporaryDirectory() as tmp:
+            marker = os.path.join(tmp, 'ejecutado')
+            task = Task('a', 'touch', 'touch', command=f'touch {marker}', working_dir='/nonexistent/dir')
+            status, details = run_task(task)
+            self.assertFalse(os.path.exists(marker))
+        self.assertEqual(status, STATUS_FAILED)
+        self.assertIn('/nonexistent/dir', details)
+
+
+class TestMain(unittest.TestCase):
+    """Pruebas para los errores de configuración en la línea de comandos."""
+
+    def test_invalid_workers_returns_error(self):
+        config = os.path.join(os.path.dirname(__file__), '..', 'docs_agent_config.toml')
+        self.assertEqual(main([config, '--workers', '0']), 1)
+        self.assertEqual(main([config, '--workers', '-2']), 1)
+
+    def test_missing_config_returns_error(self):
+        self.assertEqual(main(['/nonexistent/config.toml', '--dry-run']), 1)
+
+    def test_invalid_config_returns_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            invalid = write_config(tmp, 'invalid.toml', '[plan\n')
+            unsupported = write_config(tmp, 'unsupported.toml', '[plan]\ntasks = [1]\n')
+            self.assertEqual(main([invalid, '--dry-run']), 1)
+            self.assertEqual(main([unsupported, '--dry-run']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,20 +1,44 @@
-import requests
-import json
+import sys
+import time
+
+from model_discovery import get_catalog, load_catalog
+
+
+def print_errors(catalog, config_only=False):
+    for key, status in catalog.get("hosts", {}).items():
+        if status.get("ok"):
+            continue
+        if status.get("kind") == "config":
+            print(f"Error in host config {key} (Python): {status.get('error')}", file=sys.stderr)
+        elif not config_only:
+            print(f"Error connecting to AI server {key} (Python): {status.get('error')}", file=sys.stderr)
+
+
+def print_catalog(catalog):
+    print("Available Models (Python):")
+    for name, info in catalog.get("models", {}).items():
+        details = [info["quantization"]] if info.get("quantization") else []
+        if info.get("loaded_on"):
+            details.append("loaded")
+        suffix = f" [{', '.join(details)}]" if details else ""
+        print(f"- {name}{suffix} @ {', '.join(info['hosts'])}")
+    print_errors(catalog)
 
-SERVER_URL = "http://192.168.1.158:1234/v1"
 
 def list_models():
-    try:
-        response = requests.get(f"{SERVER_URL}/models")
-        response.raise_for_status() # Raise an exception for HTTP errors
-        models = response.json()
-        print("Available Models (Python):")
-        for model in models.get("data", []):
-            print(f"- {model.get('id')}")
-    except requests.exceptions.RequestException as e:
-        print(f"Error connecting to AI server (Python): {e}")
-    except json.JSONDecodeError:
-        print("Error: Could not decode JSON response (Python).")
+    # Show the cached snapshot right away; a stale one is refreshed for the next run.
+    catalog, refresh = get_catalog()
+    age = time.time() - catalog.get("updated_at", 0)
+    if refresh is not None:
+        print(f"(cached catalog, {age:.0f}s old; refreshing in background)")
+    print_catalog(catalog)
+    if refresh is not None:
+        refresh.join()
+        # The snapshot shown above predates the refresh; surface new config problems now.
+        updated = load_catalog()
+        if updated is not None:
+            print_errors(updated, config_only=True)
+
 
 if __name__ == "__main__":
     list_models()
@@ -0,0 +1,294 @@
+"""
+Concurrent model discovery across several inference hosts.
+
+Queries every configured OpenAI-compatible, LM Studio and Ollama host in
+parallel, each with its own timeout, merges the answers into a single catalog
+and persists it to disk so CLI tools can start from the cached snapshot while a
+refresh runs in the background.
+
+Hosts are read from hosts.json (or the file in $MODEL_HOSTS):
+
+    [
+        {"url": "http://192.168.1.158:1234/v1", "kind": "openai", "timeout": 3},
+        {"url": "http://localhost:11434", "kind": "ollama"}
+    ]
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HOSTS_FILE = os.environ.get("MODEL_HOSTS", os.path.join(BASE_DIR, "hosts.json"))
+CATALOG_FILE = os.environ.get("MODEL_CATALOG", os.path.join(BASE_DIR, "model_catalog.json"))
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_HOSTS = [
+    {"url": "http://192.168.1.158:1234/v1", "kind": "openai"},
+    {"url": "http://localhost:11434", "kind": "ollama"},
+]
+
+
+def load_hosts(path=HOSTS_FILE):
+    """
+    Returns the configured host list, or DEFAULT_HOSTS if the file does not exist.
+
+    Raises:
+        OSError, json.JSONDecodeError: If the file cannot be read or parsed.
+    """
+    if not os.path.exists(path):
+        return DEFAULT_HOSTS
+    with open(path) as f:
+        return json.load(f)
+
+
+def _failed(kind, error, latency_ms=None):
+    return {"ok": False, "error": error, "kind": kind, "latency_ms": latency_ms, "models": 0}
+
+
+def normalise_hosts(raw):
+    """
+    Validates host entries once so a bad entry cannot break discovery.
+
+    Each valid entry becomes {"url", "kind", "timeout"} with a float timeout
+    (DEFAULT_TIMEOUT if missing or invalid). Invalid and duplicate entries are
+    reported under a stable "hosts[<index>]" key with kind "config".
+
+    Returns:
+        tuple: (list of valid hosts, {key: failed status})
+    """
+    if not isinstance(raw, list):
+        return [], {"hosts": _failed("config", f"Host list must be a JSON array, got {type(raw).__name__}")}
+
+    hosts = []
+    rejected = {}
+    seen = set()
+    for index, entry in enumerate(raw):
+        key = f"hosts[{index}]"
+        if not isinstance(entry, dict):
+            rejected[key] = _failed("config", f"Host entry must be an object, got {type(entry).__name__}")
+            continue
+        url = entry.get("url")
+        kind = entry.get("kind", "openai")
+        if not isinstance(url, str) or not url:
+            rejected[key] = _failed("config", "Host entry has no 'url'")
+            continue
+        if kind not in QUERIES:
+            rejected[key] = _failed("config", f"Unknown host kind for {url}: {kind}")
+            continue
+        if url in seen:
+            # Results are keyed by URL; a second entry would silently overwrite the first.
+            rejected[key] = _failed("config", f"Duplicate host url: {url}")
+            continue
+        try:
+            timeout = float(entry.get("timeout", DEFAULT_TIMEOUT))
+        except (TypeError, ValueError):
+            timeout = DEFAULT_TIMEOUT
+        if not (timeout > 0 and math.isfinite(timeout)):
+            timeout = DEFAULT_TIMEOUT
+        seen.add(url)
+        hosts.append({"url": url, "kind": kind, "timeout": timeout})
+    return hosts, rejected
+
+
+def _get_json(url, timeout):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def _model(name, size=None, quantization=None, loaded=None):
+    return {"name": name, "size": size, "quantization": quantization, "loaded": loaded}
+
+
+def query_openai(url, timeout):
+    """GET {url}/models on an OpenAI-compatible server."""
+    data = _get_json(f"{url.rstrip('/')}/models", timeout)
+    return [_model(m["id"]) for m in data.get("data", [])]
+
+
+def query_lmstudio(url, timeout):
+    """GET /api/v0/models on LM Studio, which also reports quantization and loaded state."""
+    root = url.rstrip("/")
+    if root.endswith("/v1"):
+        root = root[:-3]
+    data = _get_json(f"{root}/api/v0/models", timeout)
+    return [
+        _model(m["id"], quantization=m.get("quantization"), loaded=m.get("state") == "loaded")
+        for m in data.get("data", [])
+    ]
+
+
+def query_ollama(url, timeout):
+    """GET /api/tags and /api/ps on an Ollama server."""
+    root = url.rstrip("/")
+    tags = _get_json(f"{root}/api/tags", timeout)
+    try:
+        loaded = {m["name"] for m in _get_json(f"{root}/api/ps", timeout).get("models", [])}
+    except (requests.exceptions.RequestException, ValueError):
+        # Older Ollama versions have no /api/ps; the loaded state stays unknown.
+        loaded = None
+    return [
+        _model(m["name"], size=m.get("size"),
+               quantization=m.get("details", {}).get("quantization_level"),
+               loaded=None if loaded is None else m["name"] in loaded)
+        for m in tags.get("models", [])
+    ]
+
+
+QUERIES = {
+    "openai": query_openai,
+    "lmstudio": query_lmstudio,
+    "ollama": query_ollama,
+}
+
+
+def _query_host(host):
+    kind = host["kind"]
+    start = time.monotonic()
+    try:
+        models = QUERIES[kind](host["url"], host["timeout"])
+        status = {"ok": True, "error": None}
+    except (requests.exceptions.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+        # TypeError/AttributeError: the host answered JSON in an unexpected shape.
+        models = []
+        status = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    status.update(kind=kind, latency_ms=round((time.monotonic() - start) * 1000, 1), models=len(models))
+    return models, status
+
+
+def merge(results):
+    """
+    Merges per-host model lists into one catalog keyed by model name.
+
+    Args:
+        results (dict): {host_url: [model dicts]}
+
+    Returns:
+        dict: {model: {"hosts", "size", "quantization", "loaded_on"}}
+    """
+    catalog = {}
+    for url, models in results.items():
+        for model in models:
+            entry = catalog.setdefault(model["name"], {
+                "hosts": [], "size": None, "quantization": None, "loaded_on": [],
+            })
+            entry["hosts"].append(url)
+            entry["size"] = entry["size"] or model["size"]
+            entry["quantization"] = entry["quantization"] or model["quantization"]
+            if model["loaded"]:
+                entry["loaded_on"].append(url)
+    return dict(sorted(catalog.items()))
+
+
+def _collect(host, results, statuses):
+    url = host["url"]
+    try:
+        results[url], statuses[url] = _query_host(host)
+    except Exception as e:
+        # One misbehaving host must never break discovery for the others.
+        statuses[url] = _failed(host["kind"], f"{type(e).__name__}: {e}")
+
+
+def discover(hosts=None):
+    """
+    Queries all hosts concurrently.
+
+    A host that does not answer within its timeout is reported as failed and
+    does not delay the others. Each host is queried in a daemon thread, so a
+    hung connection cannot keep the process alive past the deadline.
+
+    Invalid host entries and an unreadable hosts file are reported as failed
+    statuses instead of raising.
+
+    Returns:
+        dict: The catalog snapshot ({"updated_at", "hosts", "models"}).
+    """
+    results = {}
+    statuses = {}
+    if hosts is None:
+        try:
+            hosts = load_hosts(HOSTS_FILE)
+        except (OSError, json.JSONDecodeError) as e:
+            statuses[HOSTS_FILE] = _failed("config", f"Cannot read host config: {e}")
+            hosts = []
+    hosts, rejected = normalise_hosts(hosts)
+    statuses.update(rejected)
+    if hosts:
+        threads = [threading.Thread(target=_collect, args=(host, results, statuses), daemon=True)
+                   for host in hosts]
+        for thread in threads:
+            thread.start()
+        # requests' timeout applies per read, so also bound the total wait per host.
+        limit = max(host["timeout"] for host in hosts) * 2
+        deadline = time.monotonic() + limit
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        # Snapshot now: late answers from hung threads are ignored.
+        results, statuses = dict(results), dict(statuses)
+        for host in hosts:
+            if host["url"] not in statuses:
+                results.pop(host["url"], None)
+                statuses[host["url"]] = _failed(host["kind"], "timed out", limit * 1000)
+    return {"updated_at": time.time(), "hosts": statuses, "models": merge(results)}
+
+
+def save_catalog(catalog, path=CATALOG_FILE):
+    """Writes the catalog atomically so readers never see a half-written file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(catalog, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_catalog(path=CATALOG_FILE):
+    """Returns the cached catalog, or None if there is no valid snapshot yet."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def refresh(hosts=None, path=CATALOG_FILE):
+    """Runs a discovery and persists the result."""
+    catalog = discover(hosts)
+    save_catalog(catalog, path)
+    return catalog
+
+
+def refresh_in_background(hosts=None, path=CATALOG_FILE):
+    """
+    Starts a refresh in a background thread.
+
+    Returns:
+        threading.Thread: The running thread; join() it to wait for the new catalog.
+    """
+    thread = threading.Thread(target=refresh, args=(hosts, path), daemon=True)
+    thread.start()
+    return thread
+
+
+def get_catalog(max_age=300, path=CATALOG_FILE, hosts=None):
+    """
+    Returns the cached catalog immediately and refreshes it in the background
+    when it is older than max_age seconds. Without a cache it blocks on a first
+    discovery.
+
+    Returns:
+        tuple: (catalog, refresh thread or None)
+    """
+    catalog = load_catalog(path)
+    if catalog is None:
+        return refresh(hosts, path), None
+    if time.time() - catalog.get("updated_at", 0) > max_age:
+        return catalog, refresh_in_background(hosts, path)
+    return catalog, None
@@ -0,0 +1,216 @@
+import unittest
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project directory to the path so model_discovery can be imported
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import model_discovery
+
+RESPONSES = {
+    "/v1/models": {"data": [{"id": "llama3:8b"}, {"id": "phi-3"}]},
+    "/api/tags": {"models": [
+        {"name": "llama3:8b", "size": 4661224676, "details": {"quantization_level": "Q4_0"}},
+        {"name": "qwen3:8b", "size": 5225387923, "details": {"quantization_level": "Q4_K_M"}},
+    ]},
+    "/api/ps": {"models": [{"name": "qwen3:8b"}]},
+    # Valid JSON in an unexpected shape.
+    "/bad/v1/models": [],
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        found = self.path in RESPONSES
+        data = json.dumps(RESPONSES.get(self.path, {})).encode()
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(delay=0.0):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.delay = delay
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class DripHandler(socketserver.BaseRequestHandler):
+    """Sends one byte at a time so requests' per-read timeout never fires."""
+    def handle(self):
+        try:
+            for _ in range(50):
+                self.request.sendall(b"H")
+                time.sleep(0.1)
+        except OSError:
+            pass
+
+
+class TestModelDiscovery(unittest.TestCase):
+    """Tests for concurrent discovery and the catalog cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fast, cls.fast_url = start_server()
+        cls.slow, cls.slow_url = start_server(delay=2.0)
+        cls.drip = socketserver.ThreadingTCPServer(("127.0.0.1", 0), DripHandler)
+        cls.drip.daemon_threads = True
+        cls.drip_url = f"http://127.0.0.1:{cls.drip.server_address[1]}"
+        threading.Thread(target=cls.drip.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in (cls.fast, cls.slow, cls.drip):
+            server.shutdown()
+            server.server_close()
+
+    def test_merge_across_hosts(self):
+        hosts = [
+            {"url": f"{self.fast_url}/v1", "kind": "openai"},
+            {"url": self.fast_url, "kind": "ollama"},
+        ]
+        catalog = model_discovery.discover(hosts)
+
+        self.assertTrue(all(status["ok"] for status in catalog["hosts"].values()))
+        llama = catalog["models"]["llama3:8b"]
+        self.assertEqual(sorted(llama["hosts"]), sorted([f"{self.fast_url}/v1", self.fast_url]))
+        self.assertEqual(llama["quantization"], "Q4_0")
+        self.assertEqual(llama["loaded_on"], [])
+        self.assertEqual(catalog["models"]["qwen3:8b"]["loaded_on"], [self.fast_url])
+        self.assertEqual(catalog["models"]["phi-3"]["size"], None)
+
+    def test_slow_and_dead_hosts_do_not_block(self):
+        hosts = [
+            {"url": self.fast_url, "kind": "ollama", "timeout": 0.5},
+            {"url": self.slow_url, "kind": "ollama", "timeout": 0.5},
+            {"url": "http://127.0.0.1:9", "kind": "openai", "timeout": 0.5},
+        ]
+        start = time.monotonic()
+        catalog = model_discovery.discover(hosts)
+        elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1.5)
+        self.assertTrue(catalog["hosts"][self.fast_url]["ok"])
+        self.assertFalse(catalog["hosts"][self.slow_url]["ok"])
+        self.assertFalse(catalog["hosts"]["http://127.0.0.1:9"]["ok"])
+        self.assertIn("qwen3:8b", catalog["models"])
+
+    def test_malformed_response_does_not_break_other_hosts(self):
+        hosts = [
+            {"url": f"{self.fast_url}/bad/v1", "kind": "openai"},
+            {"url": self.fast_url, "kind": "ollama"},
+        ]
+        catalog = model_discovery.discover(hosts)
+
+        bad = catalog["hosts"][f"{self.fast_url}/bad/v1"]
+        self.assertFalse(bad["ok"])
+        self.assertIn("AttributeError", bad["error"])
+        self.assertTrue(catalog["hosts"][self.fast_url]["ok"])
+        self.assertIn("qwen3:8b", catalog["models"])
+
+    def test_invalid_host_entries_do_not_break_discovery(self):
+        hosts = [
+            {"kind": "ollama"},
+            {"url": self.fast_url, "kind": "ollama", "timeout": "not a number"},
+            "http://example.invalid",
+            {"url": "http://127.0.0.1:9", "kind": "gopher"},
+        ]
+        catalog = model_discovery.discover(hosts)
+
+        statuses = catalog["hosts"]
+        self.assertIn("url", statuses["hosts[0]"]["error"])
+        self.assertIn("object", statuses["hosts[2]"]["error"])
+        self.assertIn("gopher", statuses["hosts[3]"]["error"])
+        self.assertTrue(all(statuses[key]["kind"] == "config" for key in ("hosts[0]", "hosts[2]", "hosts[3]")))
+        # The entry with a bad timeout falls back to DEFAULT_TIMEOUT and still works.
+        self.assertTrue(statuses[self.fast_url]["ok"])
+        self.assertIn("qwen3:8b", catalog["models"])
+
+    def test_normalise_hosts_coerces_timeout(self):
+        hosts, rejected = model_discovery.normalise_hosts([
+            {"url": "http://a", "timeout": "1.5"},
+            {"url": "http://b", "timeout": "x"},
+            {"url": "http://c", "timeout": -1},
+        ])
+        self.assertEqual(rejected, {})
+        self.assertEqual([h["timeout"] for h in hosts], [1.5, model_discovery.DEFAULT_TIMEOUT,
+                                                       model_discovery.DEFAULT_TIMEOUT])
+        self.assertEqual(hosts[0]["kind"], "openai")
+
+    def test_duplicate_urls_are_rejected(self):
+        hosts = [
+            {"url": f"{self.fast_url}/v1", "kind": "openai"},
+            {"url": f"{self.fast_url}/v1", "kind": "lmstudio"},
+        ]
+        catalog = model_discovery.discover(hosts)
+
+        self.assertTrue(catalog["hosts"][f"{self.fast_url}/v1"]["ok"])
+        self.assertEqual(catalog["hosts"][f"{self.fast_url}/v1"]["kind"], "openai")
+        self.assertIn("Duplicate", catalog["hosts"]["hosts[1]"]["error"])
+
+    def test_malformed_hosts_file_is_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            hosts_file = os.path.join(tmp, "hosts.json")
+            with open(hosts_file, "w") as f:
+                f.write("[{not json")
+            original = model_discovery.HOSTS_FILE
+            model_discovery.HOSTS_FILE = hosts_file
+            try:
+                catalog = model_discovery.discover()
+            finally:
+                model_discovery.HOSTS_FILE = original
+
+        status = catalog["hosts"][hosts_file]
+        self.assertFalse(status["ok"])
+        self.assertEqual(status["kind"], "config")
+        self.assertEqual(catalog["models"], {})
+
+    def test_hung_host_does_not_keep_process_alive(self):
+        """The interpreter exits at the deadline even if a host never answers."""
+        script = (
+            "import model_discovery; "
+            f"c = model_discovery.discover([{{'url': '{self.drip_url}', 'kind': 'ollama', 'timeout': 0.3}}]); "
+            "assert c['hosts'] and not any(h['ok'] for h in c['hosts'].values())"
+        )
+        start = time.monotonic()
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=10,
+                       cwd=os.path.join(os.path.dirname(__file__), '..'))
+        # Deadline is 2 x 0.3 s; the dripping host would keep the socket busy for 5 s.
+        self.assertLess(time.monotonic() - start, 1.8)
+
+    def test_cached_snapshot_is_returned_while_refreshing(self):
+        hosts = [{"url": self.fast_url, "kind": "ollama"}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalog.json")
+
+            # Without a cache the first call blocks on discovery.
+            catalog, thread = model_discovery.get_catalog(path=path, hosts=hosts)
+            self.assertIsNone(thread)
+            self.assertIn("llama3:8b", catalog["models"])
+
+            # With an expired cache the snapshot is returned and refreshed in the background.
+            stale = dict(catalog, updated_at=0, models={})
+            model_discovery.save_catalog(stale, path)
+            catalog, thread = model_discovery.get_catalog(max_age=60, path=path, hosts=hosts)
+            self.assertEqual(catalog["models"], {})
+            thread.join(5)
+            self.assertIn("llama3:8b", model_discovery.load_catalog(path)["models"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Sustituto local de la API HTTP de Ollama para pruebas de carga sin conexión.
+
+Implementa los endpoints que usa mcp_ollama/ollama_mcp.py:
+- GET  /api/tags  -> lista de modelos
+- GET  /api/ps    -> modelos cargados en memoria
+- POST /api/chat  -> respuesta de chat (sin stream) con una latencia configurable
+
+Uso:
+    python fake_ollama.py --port 11434 --latency 0.05
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_MODELS = [
+    {"name": "llama3:8b", "size": 4661224676, "details": {"parameter_size": "8.0B", "quantization_level": "Q4_0"}},
+    {"name": "qwen3:8b", "size": 5225387923, "details": {"parameter_size": "8.2B", "quantization_level": "Q4_K_M"}},
+]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Atiende las peticiones imitando el formato de respuesta de Ollama."""
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": self.server.models})
+        elif self.path == "/api/ps":
+            loaded = [m for m in self.server.models if m["name"] in self.server.loaded]
+            self._send_json(200, {"models": loaded})
+        else:
+            self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self._send_json(404, {"error": f"Ruta no encontrada: {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "JSON inválido"})
+            return
+
+        model = request.get("model")
+        if model not in {m["name"] for m in self.server.models}:
+            self._send_json(404, {"error": f"model '{model}' not found"})
+            return
+
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.loaded.add(model)
+        messages = request.get("messages") or [{}]
+        prompt = messages[-1].get("content", "")
+        self._send_json(200, {
+            "model": model,
+            "message": {"role": "assistant", "content": f"Respuesta simulada a: {prompt}"},
+            "done": True,
+        })
+
+    def log_message(self, format, *args):
+        # Silencioso: el log por petición distorsiona las mediciones.
+        pass
+
+
+def make_server(host="127.0.0.1", port=11434, latency=0.0, models=None):
+    """
+    Crea el servidor sin arrancarlo.
+
+    Returns:
+        ThreadingHTTPServer: El servidor listo para serve_forever().
+    """
+    server = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+    server.models = models if models is not None else DEFAULT_MODELS
+    server.latency = latency
+    server.loaded = set()
+    server.lock = threading.Lock()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita la API de Ollama.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latencia simulada de /api/chat en segundos.")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency)
+    print(f"Ollama simulado escuchando en http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
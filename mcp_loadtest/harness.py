@@ -0,0 +1,410 @@
+"""
+Arnés de grabación y reproducción de carga para servidores MCP por stdio.
+
+Soporta los dos estilos de protocolo del repositorio:
+- JSON por líneas propio de mcp_ollama/ollama_mcp.py ({"id", "tool_name", "inputs"}).
+- JSON-RPC 2.0 de FastMCP, usado por mysql_cli_agent/mysql_mcp.py.
+
+Uso:
+    # Grabar: se coloca como proxy transparente entre el cliente MCP y el servidor
+    python harness.py record -o grabacion.jsonl -- python3 ../mcp_ollama/ollama_mcp.py
+
+    # Reproducir: velocidad original (1), escalada (p. ej. 4) o máxima (0)
+    python harness.py replay grabacion.jsonl --speed 0 --concurrency 8 -- python3 ../mcp_ollama/ollama_mcp.py
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+
+CLIENT = "client"
+SERVER = "server"
+
+
+# ---------------------------------------------------------------------------
+# Grabación
+# ---------------------------------------------------------------------------
+
+class Recorder:
+    """
+    Escribe en un archivo JSONL cada línea que cruza el proxy, con su marca de
+    tiempo relativa al inicio de la grabación.
+    """
+    def __init__(self, output_file):
+        self.file = open(output_file, "w", encoding="utf-8")
+        self.lock = threading.Lock()
+        self.start = time.monotonic()
+
+    def write(self, direction, line):
+        entry = {"t": round(time.monotonic() - self.start, 6), "direction": direction}
+        try:
+            entry["message"] = json.loads(line)
+        except json.JSONDecodeError:
+            entry["raw"] = line.rstrip("\n")
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _pump(source, target, recorder, direction):
+    """Copia líneas de source a target registrándolas en el recorder."""
+    for line in iter(source.readline, ""):
+        if line.strip():
+            recorder.write(direction, line)
+        target.write(line)
+        target.flush()
+    if target is not sys.stdout:
+        target.close()
+
+
+def record(command, output_file):
+    """
+    Lanza el servidor y actúa como proxy entre el stdin/stdout propios y los del
+    servidor, grabando todo el tráfico.
+
+    Returns:
+        int: El código de salida del servidor.
+    """
+    recorder = Recorder(output_file)
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               text=True, bufsize=1)
+    to_server = threading.Thread(target=_pump, args=(sys.stdin, process.stdin, recorder, CLIENT), daemon=True)
+    from_server = threading.Thread(target=_pump, args=(process.stdout, sys.stdout, recorder, SERVER), daemon=True)
+    to_server.start()
+    from_server.start()
+    try:
+        process.wait()
+        from_server.join()
+    except KeyboardInterrupt:
+        process.terminate()
+    finally:
+        recorder.close()
+    return process.returncode
+
+
+# ---------------------------------------------------------------------------
+# Reproducción
+# ---------------------------------------------------------------------------
+
+def load_recording(path):
+    """
+    Lee una grabación y devuelve los mensajes enviados por el cliente.
+
+    Returns:
+        list: Una lista de tuplas (t, mensaje) ordenada por tiempo.
+    """
+    messages = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("direction") == CLIENT and "message" in entry:
+                messages.append((float(entry.get("t", 0.0)), entry["message"]))
+    messages.sort(key=lambda item: item[0])
+    return messages
+
+
+def tool_name(message):
+    """Nombre con el que se agrupan las métricas de una petición."""
+    if "tool_name" in message:
+        return message["tool_name"]
+    if message.get("method") == "tools/call":
+        return message.get("params", {}).get("name", "tools/call")
+    return message.get("method", "desconocido")
+
+
+def _is_error_payload(value):
+    """Un resultado de herramienta del estilo {"error": ...} o {"success": False, ...}."""
+    if not isinstance(value, dict):
+        return False
+    if value.get("error") or value.get("success") is False:
+        return True
+    # FastMCP envuelve en {"result": ...} los valores de retorno que no son objetos.
+    return _is_error_payload(value.get("result"))
+
+
+def is_error(response):
+    """
+    Indica si la respuesta del servidor representa un error.
+
+    Además de los errores del protocolo, cuenta como error el resultado normal de
+    una herramienta que informa de un fallo, como hace mysql_mcp.py al devolver
+    {"error": "..."} (sin conexión, error de SQL, etc.).
+    """
+    if "error" in response:
+        return True
+    result = response.get("result")
+    if not isinstance(result, dict):
+        return False
+    if result.get("isError") or _is_error_payload(result.get("structuredContent")):
+        return True
+    for item in result.get("content") or []:
+        if isinstance(item, dict) and item.get("type") == "text":
+            try:
+                if _is_error_payload(json.loads(item.get("text", ""))):
+                    return True
+            except json.JSONDecodeError:
+                continue
+    return False
+
+
+def is_handshake(message):
+    """Mensajes de inicialización de MCP que deben completarse antes que el resto."""
+    return message.get("method") in ("initialize", "notifications/initialized")
+
+
+def percentile(values, pct):
+    """Percentil por el método del rango más cercano."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class Stats:
+    """Acumula latencias y errores por herramienta."""
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, tool, latency, error):
+        self.latencies.setdefault(tool, []).append(latency)
+        self.errors[tool] = self.errors.get(tool, 0) + (1 if error else 0)
+
+    def summary(self, wall_time):
+        """
+        Devuelve un diccionario con las métricas por herramienta y globales.
+        """
+        tools = {}
+        for tool, values in sorted(self.latencies.items()):
+            tools[tool] = {
+                "count": len(values),
+                "errors": self.errors[tool],
+                "error_rate": self.errors[tool] / len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p90_ms": percentile(values, 90) * 1000,
+                "p99_ms": percentile(values, 99) * 1000,
+                "max_ms": max(values) * 1000,
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        errors = sum(self.errors.values())
+        return {
+            "tools": tools,
+            "total": total,
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "wall_time_s": wall_time,
+            "throughput_rps": total / wall_time if wall_time > 0 else 0.0,
+        }
+
+
+class Session:
+    """
+    Una conexión stdio con un proceso del servidor. Reescribe los ids de las
+    peticiones para que sean únicos y asocia cada respuesta con su petición.
+    """
+    def __init__(self, command, env=None, timeout=30.0, quiet=False):
+        self.command = command
+        self.env = env
+        self.timeout = timeout
+        self.quiet = quiet
+        self.process = None
+        self.pending = {}
+        self.next_id = 1
+        self.reader = None
+        self.closed = False
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL if self.quiet else None, env=self.env, limit=2 ** 24)
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            future = self.pending.pop(response.get("id"), None) if isinstance(response, dict) else None
+            if future and not future.done():
+                future.set_result(response)
+        # El servidor terminó: las peticiones pendientes ya no tendrán respuesta.
+        self.closed = True
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("El servidor cerró stdout."))
+        self.pending.clear()
+
+    async def _write(self, message):
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+        await self.process.stdin.drain()
+
+    async def send(self, message, stats):
+        """Envía un mensaje; si es una petición, espera la respuesta y la mide."""
+        if "id" not in message:
+            # Notificación (p. ej. notifications/initialized): no hay respuesta.
+            await self._write(message)
+            return
+
+        message = dict(message, id=self.next_id)
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[message["id"]] = future
+
+        start = time.monotonic()
+        try:
+            if self.closed:
+                raise ConnectionError("El servidor cerró stdout.")
+            await self._write(message)
+            response = await asyncio.wait_for(future, self.timeout)
+            error = is_error(response)
+        except (asyncio.TimeoutError, ConnectionError, BrokenPipeError):
+            self.pending.pop(message["id"], None)
+            error = True
+        stats.add(tool_name(message), time.monotonic() - start, error)
+
+    async def close(self):
+        if self.process.returncode is None:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), 5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        self.reader.cancel()
+
+
+async def replay_session(command, messages, stats, speed=1.0, window=1, repeat=1, env=None, timeout=30.0,
+                         quiet=False):
+    """
+    Reproduce la grabación en un proceso del servidor.
+
+    Args:
+        speed (float): 1 = ritmo original, >1 más rápido, 0 = máxima velocidad.
+        window (int): Número máximo de peticiones en vuelo en la sesión. Con
+            window > 1 las peticiones que dependen unas de otras pueden llegar
+            desordenadas al servidor.
+        repeat (int): Veces que se repite la grabación en la misma sesión.
+
+    La inicialización (initialize y notifications/initialized) se envía una sola
+    vez y en orden, esperando su respuesta, antes de abrir la ventana.
+    """
+    session = Session(command, env=env, timeout=timeout, quiet=quiet)
+    await session.start()
+    slots = asyncio.Semaphore(window)
+    in_flight = set()
+
+    async def send(message):
+        try:
+            await session.send(message, stats)
+        finally:
+            slots.release()
+
+    handshake = [message for _, message in messages if is_handshake(message)]
+    body = [(offset, message) for offset, message in messages if not is_handshake(message)]
+
+    try:
+        for message in handshake:
+            await session.send(message, stats)
+
+        for _ in range(repeat):
+            start = time.monotonic()
+            base = body[0][0] if body else 0.0
+            for offset, message in body:
+                offset -= base
+                if speed > 0:
+                    delay = offset / speed - (time.monotonic() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await slots.acquire()
+                task = asyncio.create_task(send(message))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+    finally:
+        await session.close()
+
+
+async def replay(command, messages, speed=1.0, concurrency=1, window=1, repeat=1, env=None, timeout=30.0,
+                 quiet=False):
+    """
+    Lanza 'concurrency' sesiones simultáneas, cada una con su propio proceso del
+    servidor, y devuelve el resumen de métricas.
+    """
+    stats = Stats()
+    start = time.monotonic()
+    await asyncio.gather(*(
+        replay_session(command, messages, stats, speed, window, repeat, env, timeout, quiet)
+        for _ in range(concurrency)))
+    return stats.summary(time.monotonic() - start)
+
+
+def format_summary(summary):
+    """Genera una tabla legible con las métricas de la reproducción."""
+    lines = [f"{'herramienta':<28}{'n':>6}{'err%':>7}{'p50ms':>9}{'p90ms':>9}{'p99ms':>9}{'maxms':>9}"]
+    for tool, data in summary["tools"].items():
+        lines.append(f"{tool:<28}{data['count']:>6}{data['error_rate'] * 100:>7.1f}"
+                     f"{data['p50_ms']:>9.1f}{data['p90_ms']:>9.1f}{data['p99_ms']:>9.1f}{data['max_ms']:>9.1f}")
+    lines.append("")
+    lines.append(f"Peticiones: {summary['total']}  Errores: {summary['errors']} "
+                 f"({summary['error_rate'] * 100:.1f}%)")
+    lines.append(f"Tiempo: {summary['wall_time_s']:.2f}s  Rendimiento: {summary['throughput_rps']:.1f} peticiones/s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = []
+    if "--" in argv:
+        index = argv.index("--")
+        argv, command = argv[:index], argv[index + 1:]
+
+    parser = argparse.ArgumentParser(description="Graba y reproduce tráfico stdio de servidores MCP.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    rec = sub.add_parser("record", help="Proxy que graba el tráfico entre cliente y servidor.")
+    rec.add_argument("-o", "--output", required=True, help="Archivo JSONL de salida.")
+
+    rep = sub.add_parser("replay", help="Reproduce una grabación contra el servidor.")
+    rep.add_argument("recording", help="Archivo JSONL grabado.")
+    rep.add_argument("--speed", type=float, default=1.0,
+                     help="1 = ritmo original, 2 = el doble de rápido, 0 = máxima velocidad.")
+    rep.add_argument("--concurrency", type=int, default=1, help="Sesiones (procesos del servidor) simultáneas.")
+    rep.add_argument("--window", type=int, default=1, help="Peticiones en vuelo por sesión.")
+    rep.add_argument("--repeat", type=int, default=1, help="Repeticiones de la grabación por sesión.")
+    rep.add_argument("--timeout", type=float, default=30.0, help="Tiempo máximo de espera por respuesta (s).")
+    rep.add_argument("--quiet", action="store_true", help="Descarta el stderr del servidor.")
+    rep.add_argument("--json", action="store_true", help="Muestra el resumen en formato JSON.")
+
+    args = parser.parse_args(argv)
+    if not command:
+        parser.error("Falta el comando del servidor después de '--'.")
+
+    if args.mode == "record":
+        return record(command, args.output)
+
+    messages = load_recording(args.recording)
+    summary = asyncio.run(replay(command, messages, speed=args.speed, concurrency=args.concurrency,
+                                 window=args.window, repeat=args.repeat, env=os.environ.copy(),
+                                 timeout=args.timeout, quiet=args.quiet))
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    return 0 if summary["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
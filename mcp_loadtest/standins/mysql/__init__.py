@@ -0,0 +1,6 @@
+"""
+Sustituto local de mysql-connector-python respaldado por SQLite.
+
+Se activa añadiendo mcp_loadtest/standins al PYTHONPATH antes de lanzar
+mysql_cli_agent/mysql_mcp.py, de modo que el servidor funcione sin un MySQL real.
+"""
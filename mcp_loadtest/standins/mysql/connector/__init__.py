@@ -0,0 +1,116 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from . import errorcode
+
+# Latencia artificial por consulta (segundos), para simular un servidor remoto.
+QUERY_LATENCY = float(os.environ.get("MYSQL_STANDIN_LATENCY", "0"))
+# Directorio donde guardar las bases de datos; vacío = solo en memoria.
+DATA_DIR = os.environ.get("MYSQL_STANDIN_DIR", "")
+
+
+class Error(Exception):
+    """Equivalente a mysql.connector.Error."""
+    def __init__(self, msg=None, errno=None):
+        super().__init__(msg)
+        self.msg = msg
+        self.errno = errno
+
+    def __str__(self):
+        return f"{self.errno} ({self.msg})" if self.errno else str(self.msg)
+
+
+_SHOW_COLUMNS = re.compile(r"^\s*SHOW\s+COLUMNS\s+FROM\s+`?(\w+)`?\s*;?\s*$", re.IGNORECASE)
+_SHOW_TABLES = re.compile(r"^\s*SHOW\s+TABLES\s*;?\s*$", re.IGNORECASE)
+
+
+class CursorStandin:
+    """Cursor compatible con el subconjunto de la API que usa DBManager."""
+    def __init__(self, connection):
+        self._connection = connection
+        self._cursor = connection._db.cursor()
+        self._rows = None
+        self.description = None
+        self.rowcount = -1
+
+    def execute(self, query, params=None):
+        if QUERY_LATENCY:
+            time.sleep(QUERY_LATENCY)
+        with self._connection._lock:
+            try:
+                if _SHOW_TABLES.match(query):
+                    self._cursor.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+                    self.description = [("Tables",)]
+                    self._rows = self._cursor.fetchall()
+                elif _SHOW_COLUMNS.match(query):
+                    self._show_columns(_SHOW_COLUMNS.match(query).group(1))
+                else:
+                    self._cursor.execute(query, params or ())
+                    self.description = [(d[0],) for d in self._cursor.description] if self._cursor.description else None
+                    self._rows = self._cursor.fetchall() if self.description else None
+                self.rowcount = self._cursor.rowcount
+            except sqlite3.Error as err:
+                errno = errorcode.ER_NO_SUCH_TABLE if "no such table" in str(err) else errorcode.ER_PARSE_ERROR
+                raise Error(str(err), errno) from err
+
+    def _show_columns(self, table_name):
+        self._cursor.execute(f"PRAGMA table_info({table_name})")
+        rows = self._cursor.fetchall()
+        if not rows:
+            raise Error(f"Table '{table_name}' doesn't exist", errorcode.ER_NO_SUCH_TABLE)
+        self.description = [("Field",), ("Type",), ("Null",), ("Key",), ("Default",), ("Extra",)]
+        self._rows = [
+            (name, col_type, "NO" if notnull else "YES", "PRI" if pk else "", default, "")
+            for _, name, col_type, notnull, default, pk in rows
+        ]
+
+    def fetchall(self):
+        rows, self._rows = self._rows or [], None
+        return rows
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConnectionStandin:
+    """Conexión compatible con el subconjunto de la API que usa DBManager."""
+    def __init__(self, database):
+        path = os.path.join(DATA_DIR, f"{database}.sqlite3") if DATA_DIR else ":memory:"
+        # check_same_thread=False: el servidor MCP llama desde asyncio.to_thread.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._open = True
+
+    def cursor(self):
+        return CursorStandin(self)
+
+    def is_connected(self):
+        return self._open
+
+    def commit(self):
+        self._db.commit()
+
+    def rollback(self):
+        self._db.rollback()
+
+    def close(self):
+        self._db.close()
+        self._open = False
+
+
+def connect(host=None, user=None, password=None, database=None, port=3306, **kwargs):
+    """
+    Abre una conexión SQLite en lugar de MySQL.
+
+    Las credenciales se aceptan sin validar, salvo la contraseña 'denied', que
+    permite simular un error de acceso.
+    """
+    if password == "denied":
+        raise Error(f"Access denied for user '{user}'@'{host}'", errorcode.ER_ACCESS_DENIED_ERROR)
+    if not database:
+        raise Error("No database selected", errorcode.ER_BAD_DB_ERROR)
+    return ConnectionStandin(database)
@@ -0,0 +1,5 @@
+# Códigos de error de MySQL usados por DBManager.
+ER_ACCESS_DENIED_ERROR = 1045
+ER_BAD_DB_ERROR = 1049
+ER_NO_SUCH_TABLE = 1146
+ER_PARSE_ERROR = 1064
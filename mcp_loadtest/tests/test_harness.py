@@ -0,0 +1,184 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# Añadir mcp_loadtest, sus sustitutos y el src de mysql_cli_agent al path
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, 'standins'))
+sys.path.insert(0, os.path.join(BASE_DIR, '..', 'mysql_cli_agent', 'src'))
+
+import harness
+from harness import Stats, is_error, load_recording, percentile, replay, tool_name
+
+# Servidor mínimo estilo ollama_mcp: responde a cada línea con el mismo id.
+ECHO_SERVER = '''
+import json, sys
+for line in sys.stdin:
+    request = json.loads(line)
+    response = {"id": request["id"]}
+    if request["tool_name"] == "falla":
+        response["error"] = {"message": "fallo"}
+    else:
+        response["payload"] = {"ok": True}
+    print(json.dumps(response), flush=True)
+'''
+
+
+class TestHarnessHelpers(unittest.TestCase):
+    """Pruebas para las utilidades de métricas y grabaciones."""
+
+    def test_percentile_nearest_rank(self):
+        values = [0.1 * i for i in range(1, 11)]
+        self.assertAlmostEqual(percentile(values, 50), 0.5)
+        self.assertAlmostEqual(percentile(values, 90), 0.9)
+        self.assertAlmostEqual(percentile(values, 99), 1.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_tool_name_and_errors_for_both_protocols(self):
+        self.assertEqual(tool_name({"id": 1, "tool_name": "list_models"}), "list_models")
+        self.assertEqual(tool_name({"method": "tools/call", "params": {"name": "database_list_tables"}}),
+                         "database_list_tables")
+        self.assertEqual(tool_name({"method": "initialize"}), "initialize")
+        self.assertTrue(is_error({"id": 1, "error": {"message": "x"}}))
+        self.assertTrue(is_error({"id": 1, "result": {"isError": True}}))
+        self.assertFalse(is_error({"id": 1, "result": {"content": []}}))
+
+    def test_tool_level_errors_in_mcp_results(self):
+        """Los fallos que mysql_mcp.py devuelve como resultado normal cuentan como error."""
+        def text_result(payload):
+            return {"id": 1, "result": {"content": [{"type": "text", "text": json.dumps(payload)}],
+                                        "isError": False}}
+
+        self.assertTrue(is_error(text_result({"error": "No estás conectado a ninguna base de datos."})))
+        self.assertTrue(is_error(text_result({"success": False, "message": "Error al conectar"})))
+        self.assertTrue(is_error({"id": 1, "result": {"content": [],
+                                                      "structuredContent": {"result": {"error": "x"}}}}))
+        self.assertFalse(is_error(text_result({"success": True, "message": "Conexión exitosa."})))
+        self.assertFalse(is_error(text_result(["tabla1", "tabla2"])))
+        # Una clave "error" vacía no es un fallo.
+        self.assertFalse(is_error(text_result({"error": None, "rows_affected": 1})))
+        self.assertFalse(is_error({"id": 1, "result": {"content": [], "structuredContent": {"error": ""}}}))
+        self.assertFalse(is_error({"id": 1, "result": {"content": [{"type": "text", "text": "texto libre"}]}}))
+
+    def test_load_recording_keeps_only_client_messages(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as f:
+            f.write(json.dumps({"t": 0.5, "direction": "client", "message": {"id": 2}}) + "\n")
+            f.write(json.dumps({"t": 0.6, "direction": "server", "message": {"id": 2}}) + "\n")
+            f.write(json.dumps({"t": 0.1, "direction": "client", "message": {"id": 1}}) + "\n")
+            f.write(json.dumps({"t": 0.2, "direction": "client", "raw": "basura"}) + "\n")
+        try:
+            messages = load_recording(f.name)
+        finally:
+            os.remove(f.name)
+        self.assertEqual(messages, [(0.1, {"id": 1}), (0.5, {"id": 2})])
+
+    def test_stats_summary(self):
+        stats = Stats()
+        stats.add("a", 0.010, False)
+        stats.add("a", 0.030, True)
+        summary = stats.summary(2.0)
+        self.assertEqual(summary["total"], 2)
+        self.assertEqual(summary["tools"]["a"]["error_rate"], 0.5)
+        self.assertAlmostEqual(summary["throughput_rps"], 1.0)
+
+
+class TestReplay(unittest.TestCase):
+    """Pruebas de reproducción contra un servidor stdio real."""
+
+    def test_replay_max_rate_with_concurrency(self):
+        messages = [
+            (0.0, {"id": "x", "tool_name": "list_models", "inputs": {}}),
+            (5.0, {"id": "x", "tool_name": "falla", "inputs": {}}),
+        ]
+        summary = asyncio.run(replay([sys.executable, '-c', ECHO_SERVER], messages,
+                                     speed=0, concurrency=3, window=2, repeat=2))
+
+        self.assertEqual(summary["total"], 12)
+        self.assertEqual(summary["tools"]["list_models"]["errors"], 0)
+        self.assertEqual(summary["tools"]["falla"]["errors"], 6)
+        # A velocidad máxima no se respeta el hueco de 5 s de la grabación.
+        self.assertLess(summary["wall_time_s"], 5.0)
+
+    def test_handshake_completes_before_window_opens(self):
+        """Con window > 1 no se envía nada hasta que initialize haya respondido."""
+        events = []
+
+        class FakeSession:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            async def start(self):
+                pass
+
+            async def send(self, message, stats):
+                method = message.get("method")
+                events.append(("envío", method))
+                if method == "initialize":
+                    await asyncio.sleep(0.1)
+                events.append(("respuesta", method))
+
+            async def close(self):
+                pass
+
+        messages = [
+            (0.0, {"jsonrpc": "2.0", "id": 0, "method": "initialize"}),
+            (0.0, {"jsonrpc": "2.0", "method": "notifications/initialized"}),
+            (0.0, {"jsonrpc": "2.0", "id": 1, "method": "tools/call"}),
+            (0.0, {"jsonrpc": "2.0", "id": 2, "method": "tools/call"}),
+        ]
+        original = harness.Session
+        harness.Session = FakeSession
+        try:
+            asyncio.run(replay(["servidor"], messages, speed=0, window=4, repeat=2))
+        finally:
+            harness.Session = original
+
+        first_call = events.index(("envío", "tools/call"))
+        self.assertLess(events.index(("respuesta", "initialize")), first_call)
+        self.assertLess(events.index(("envío", "notifications/initialized")), first_call)
+        self.assertEqual(events.count(("envío", "initialize")), 1)
+        self.assertEqual(events.count(("envío", "tools/call")), 4)
+
+    def test_replay_counts_dead_server_as_errors(self):
+        messages = [(0.0, {"id": 1, "tool_name": "list_models", "inputs": {}})]
+        summary = asyncio.run(replay([sys.executable, '-c', 'pass'], messages, speed=0, timeout=5))
+        self.assertEqual(summary["errors"], 1)
+
+
+class TestMySQLStandin(unittest.TestCase):
+    """Pruebas del sustituto SQLite de mysql.connector con el DBManager real."""
+
+    def setUp(self):
+        from db_manager import DBManager
+        self.db_manager = DBManager()
+        success, _ = self.db_manager.connect(
+            {'host': 'localhost', 'user': 'root', 'password': 'x', 'database': 'prueba', 'port': 3306})
+        self.assertTrue(success)
+
+    def tearDown(self):
+        self.db_manager.close()
+
+    def test_queries_and_schema(self):
+        self.db_manager.execute_query("CREATE TABLE productos (id INTEGER PRIMARY KEY, nombre VARCHAR(50))")
+        result = self.db_manager.execute_query("INSERT INTO productos (nombre) VALUES ('a'), ('b')")
+        self.assertEqual(result, {'rows_affected': 2})
+
+        self.assertEqual(self.db_manager.list_tables(), ['productos'])
+        description = self.db_manager.describe_table('productos')
+        self.assertEqual([col['Field'] for col in description], ['id', 'nombre'])
+        self.assertEqual(description[0]['Key'], 'PRI')
+
+        result = self.db_manager.execute_query("SELECT nombre FROM productos ORDER BY id")
+        self.assertEqual(result, {'headers': ['nombre'], 'rows': [('a',), ('b',)]})
+
+    def test_sql_error_is_reported(self):
+        result = self.db_manager.execute_query("SELECT * FROM inexistente")
+        self.assertIn('error', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -83,9 +83,11 @@ class OllamaMCP:
         return messages, 0
 
 import sys
+import os
 
 def main():
-    mcp = OllamaMCP()
+    # OLLAMA_URL permite apuntar a otro servidor (p. ej. el simulado de mcp_loadtest)
+    mcp = OllamaMCP(os.environ.get("OLLAMA_URL", "http://localhost:11434"))
 
     while True:
         try: